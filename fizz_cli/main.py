@@ -1,26 +1,37 @@
 import subprocess
 import time
+from typing import List
+from typing import Optional
 
 import typer
 from click import clear
 from rich import print
 
+from .utils import BUNDLE_DIR
+from .utils import BUNDLE_FILE
+from .utils import SPECS_DIR
+from .utils import apply_manifest_to_specs
 from .utils import bold_blue
+from .utils import bundle_specs
 from .utils import check_fission_directory
 from .utils import create_new_fn_spec_and_boilerplate
 from .utils import delete_file_if_exists
 from .utils import delete_function
 from .utils import ensure_leading_slash
+from .utils import ensure_manifest
 from .utils import enumerate_functions
 from .utils import exec_package_script
 from .utils import get_fn_route_path
 from .utils import id_generator
 from .utils import init_fission
+from .utils import load_manifest
 from .utils import read_yaml_file
 from .utils import rename_fn_in_specs
 from .utils import rename_folder
 from .utils import replace_route
 from .utils import save_yaml_file
+from .utils import split_bundle
+from .utils import sync_manifest
 from .utils import update_shell_scripts
 from .utils import get_current_environment
 
@@ -29,9 +40,13 @@ route_app = typer.Typer(help=f"Manage {bold_blue('routes')} for functions.")
 fn_app = typer.Typer(
     help=f"Manage {bold_blue('functions')}. fn is not mandatory, all commands pertaining to functions also work without fn keyword ."
 )
+bundle_app = typer.Typer(
+    help=f"Bundle {bold_blue('specs')} into a single multi-document YAML file for faster spec apply."
+)
 
 app.add_typer(route_app, name="route")
 app.add_typer(fn_app, name="fn")
+app.add_typer(bundle_app, name="bundle")
 
 
 @app.command()
@@ -41,19 +56,27 @@ def new(function_name: str):
     Creates a new function with the given name.
     """
     print(f"Creating new function: {function_name} \n")
-    created = create_new_fn_spec_and_boilerplate(function_name)
-    env = get_current_environment()
+    fn_config = load_manifest()["functions"].get(function_name) or {}
+    env = fn_config.get("env") or get_current_environment()
+    if not env:
+        print("[bold red]No environment found, run init or set env for the function in fizz.yaml.[/bold red]")
+        return
+
+    created = create_new_fn_spec_and_boilerplate(function_name, env)
     if created:
+        manifest = load_manifest()
+        buildcmd = manifest["build"]["buildcmd"]
+        entrypoint = manifest["functions"][function_name]["entrypoint"]
         executed = exec_package_script()
         if executed:
             subprocess.run(
-                f'fission package create --sourcearchive {function_name}.zip --env {env} --buildcmd "./build.sh"  --name {function_name} --spec',
+                f'fission package create --sourcearchive {function_name}.zip --env {env} --buildcmd "{buildcmd}"  --name {function_name} --spec',
                 shell=True,
                 text=False,
                 capture_output=False,
             )
             subprocess.run(
-                f'fission fn create --name {function_name} --pkg {function_name} --entrypoint "main.main" --env=ipl-2024 --spec',
+                f'fission fn create --name {function_name} --pkg {function_name} --entrypoint "{entrypoint}" --env={env} --spec',
                 shell=True,
                 text=False,
                 capture_output=False,
@@ -77,6 +100,19 @@ def init():
     init_fission()
 
 
+@app.command()
+def sync():
+    """
+    Applies the fizz.yaml project manifest to the package and function specs and regenerates the bash/bat package scripts.
+    """
+    manifest = load_manifest()
+    synced = sync_manifest(manifest) and apply_manifest_to_specs(manifest)
+    if synced:
+        print("[bold green]Specs and package scripts are in sync with fizz.yaml.[/bold green]")
+    else:
+        print("[bold red]Failed to sync package scripts.[/bold red]")
+
+
 @app.command()
 @fn_app.command()
 def delete(function_name: str):
@@ -99,7 +135,7 @@ def rename(fn_name: str):
     Renames an existing function to a new name.
     """
     typer.confirm(
-        "Modify folder name? NOTE: bash/bat scripts will also be modified.",
+        "Modify folder name? NOTE: fizz.yaml and the generated bash/bat scripts will also be modified.",
         default=True,
         abort=True,
     )
@@ -107,6 +143,7 @@ def rename(fn_name: str):
         "Function Name: ",
         default=bold_blue(f"function{id_generator()}"),
     )
+    ensure_manifest()
     success = rename_folder(fn_name, new_fn_name)
 
     if success:
@@ -161,6 +198,44 @@ def route_delete(function_name: str):
         )
 
 
+@bundle_app.command("create")
+def bundle_create(
+    function_names: Optional[List[str]] = typer.Argument(None, help="Only bundle these functions."),
+    output_dir: str = typer.Option(
+        BUNDLE_DIR, "--output-dir", "-o", help="Directory directly under the project root to write the bundle to."
+    ),
+):
+    """
+    Bundles all specs, or those of the given functions, into one multi-document YAML file.
+    The output directory must sit directly under the project root so that fission can find the zip archives.
+    A subset bundle holds the package, function and route specs of the given functions and the env specs they use;
+    other triggers such as timers or message queue triggers are only included when bundling everything.
+    """
+    count = bundle_specs(function_names, output_dir)
+    if count is None:
+        print("[bold red]Failed to create bundle.[/bold red]")
+    else:
+        print(
+            f"[bold green]Bundled {count} spec files into {output_dir}/{BUNDLE_FILE}.[/bold green]\n"
+            f"Apply it with: fission spec apply --specdir {output_dir}"
+        )
+
+
+@bundle_app.command("split")
+def bundle_split(
+    bundle_path: str = typer.Argument(f"{BUNDLE_DIR}/{BUNDLE_FILE}"),
+    specs_dir: str = typer.Option(SPECS_DIR, "--specs-dir", "-s", help="Directory to write the spec files to."),
+):
+    """
+    Splits a bundle back into per-function spec files.
+    """
+    written = split_bundle(bundle_path, specs_dir)
+    if written is None:
+        print("[bold red]Failed to split bundle.[/bold red]")
+    else:
+        print(f"[bold green]Wrote {len(written)} spec files to {specs_dir}.[/bold green]")
+
+
 @app.command()
 def i():
     """
@@ -6,6 +6,7 @@ import re
 import shutil
 import string
 import subprocess
+import tempfile
 from importlib import resources
 
 import typer
@@ -15,9 +16,24 @@ from rich.progress import Progress
 from rich.progress import SpinnerColumn
 from rich.progress import TextColumn
 
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
+    from yaml import SafeLoader as YamlLoader
+
 SPECS_DIR = "./specs"
 SH_FILE = "lin-package.sh"
 BAT_FILE = "win-package.bat"
+MANIFEST_FILE = "fizz.yaml"
+DEFAULT_BUILDCMD = "./build.sh"
+DEFAULT_ENTRYPOINT = "main.main"
+BUNDLE_DIR = "./bundle"
+BUNDLE_FILE = "specs.yaml"
+DEPLOYMENT_CONFIG_FILE = "fission-deployment-config.yaml"
+BUNDLE_SOURCE_MARKER = "# fizz-source: "
+SPEC_PREFIX_ORDER = ["env", "package", "function", "route"]
 
 
 def id_generator(size=6, chars=string.ascii_uppercase + string.digits):
@@ -161,28 +177,267 @@ def rename_folder(current_fn, new_fn):
         return False
 
 
-def update_shell_scripts(fn_name, new_fn_name):
+def new_manifest():
+    return {
+        "build": {"buildcmd": DEFAULT_BUILDCMD},
+        "functions": {},
+    }
+
+
+def normalise_manifest(manifest):
+    """
+    Checks the types of the manifest entries and fills in missing or explicitly empty (null)
+    entries with their defaults. Function names are always strings.
+
+    Raises:
+        ValueError: If an entry has the wrong type.
+    """
+    manifest = manifest or {}
+    if not isinstance(manifest, dict):
+        raise ValueError("expected a mapping with 'build' and 'functions' keys")
+
+    build = manifest.get("build") or {}
+    if not isinstance(build, dict):
+        raise ValueError("'build' must be a mapping, e.g. 'build: {buildcmd: ./build.sh}'")
+    buildcmd = build.get("buildcmd") or DEFAULT_BUILDCMD
+    if not isinstance(buildcmd, str) or not buildcmd.strip():
+        raise ValueError("'build.buildcmd' must be a non-empty string")
+    build["buildcmd"] = buildcmd.strip()
+
+    fn_configs = manifest.get("functions") or {}
+    if not isinstance(fn_configs, dict):
+        raise ValueError("'functions' must be a mapping of function names to their env and entrypoint")
+
+    functions = {}
+    for fn_name, config in fn_configs.items():
+        config = config or {}
+        if not isinstance(config, dict):
+            raise ValueError(f"'functions.{fn_name}' must be a mapping, e.g. '{fn_name}: {{env: ..., entrypoint: ...}}'")
+        for key in ["env", "entrypoint"]:
+            if config.get(key) is not None and not isinstance(config[key], str):
+                raise ValueError(f"'functions.{fn_name}.{key}' must be a string")
+        config["env"] = config.get("env")
+        config["entrypoint"] = config.get("entrypoint") or DEFAULT_ENTRYPOINT
+        functions[str(fn_name)] = config
+
+    return {"build": build, "functions": functions}
+
+
+def get_entrypoint_from_fn_config(fn_name):
+    success, config = read_yaml_file("function", fn_name)
+    try:
+        return config["spec"]["package"]["functionName"] if success else None
+    except (KeyError, TypeError):
+        return None
+
+
+def migrate_to_manifest():
+    """
+    Builds a manifest for projects created before fizz.yaml existed from the specs directory.
+    The existing package scripts are backed up since they are regenerated from the manifest.
+
+    Returns:
+        dict: The migrated manifest.
+    """
+    manifest = new_manifest()
+    if not check_fission_directory():
+        return manifest
+
+    for script in [SH_FILE, BAT_FILE]:
+        if os.path.isfile(script) and not os.path.exists(f"{script}.bak"):
+            shutil.copyfile(script, f"{script}.bak")
+            print(f"[bold yellow]{script} will be generated from {MANIFEST_FILE}, backed up to {script}.bak[/bold yellow]")
+
+    env = get_current_environment() or None
+    skipped = []
+    for fn_name in enumerate_functions():
+        if not os.path.isdir(fn_name):
+            skipped.append(fn_name)
+            continue
+        try:
+            fn_env = get_environment_from_package_config(fn_name) or env
+        except Exception:
+            fn_env = env
+        manifest["functions"][fn_name] = {
+            "env": fn_env,
+            "entrypoint": get_entrypoint_from_fn_config(fn_name) or DEFAULT_ENTRYPOINT,
+        }
+
+    if skipped:
+        print(
+            f"[bold yellow]No code folder found for {', '.join(skipped)}, "
+            f"left out of {MANIFEST_FILE} and the package scripts.[/bold yellow]"
+        )
+
+    return manifest
+
+
+def load_manifest():
+    """
+    Loads the project manifest, migrating projects created before the manifest existed.
+
+    Returns:
+        dict: The manifest with 'build' and 'functions' keys.
+    """
+    if not os.path.isfile(MANIFEST_FILE):
+        return migrate_to_manifest()
+
+    try:
+        with open(MANIFEST_FILE, "r") as file:
+            return normalise_manifest(yaml.load(file, Loader=YamlLoader))
+    except (yaml.YAMLError, ValueError) as e:
+        print(f"[bold red]Malformed {MANIFEST_FILE}: {e}[/bold red]")
+        raise typer.Exit(code=1)
+
+
+def ensure_manifest():
+    """
+    Writes the manifest of projects created before fizz.yaml existed, so that it is migrated
+    while every code folder is still in place.
+    """
+    if not os.path.isfile(MANIFEST_FILE):
+        sync_manifest(migrate_to_manifest())
+
+
+def save_manifest(manifest):
+    try:
+        manifest["functions"] = dict(sorted(manifest["functions"].items()))
+        with open(MANIFEST_FILE, "w") as file:
+            yaml.dump(manifest, file, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
+        return True
+    except Exception as e:
+        print(f"[bold red]Error writing {MANIFEST_FILE}: {e}[/bold red]")
+        return False
+
+
+def generate_package_scripts(manifest):
+    """
+    Regenerates lin-package.sh and win-package.bat from the functions listed in the manifest.
+
+    Parameters:
+        manifest (dict): The project manifest.
+
+    Returns:
+        bool: True if both scripts were written, False otherwise.
+    """
     try:
-        pushd_pattern = re.compile(rf"pushd {re.escape(fn_name)}\b")
-        zip_pattern = re.compile(rf"\b{re.escape(fn_name)}.zip")
-
-        # Replace in .sh file
-        with open(SH_FILE, "r") as file:
-            sh_content = file.read()
-        sh_content = pushd_pattern.sub(f"pushd {new_fn_name}", sh_content)
-        sh_content = zip_pattern.sub(f"{new_fn_name}.zip", sh_content)
+        fn_names = sorted(manifest["functions"])
+        header = f"Generated by fizz from {MANIFEST_FILE}, do not edit. Run 'fizz sync' instead."
+
+        sh_content = f"#!/bin/bash\n# {header}\n"
+        for fn_name in fn_names:
+            sh_content += f"\npushd {fn_name}\nzip -q -r ../{fn_name}.zip *\npopd\n"
         with open(SH_FILE, "w") as file:
             file.write(sh_content)
+        os.chmod(SH_FILE, os.stat(SH_FILE).st_mode | 0o111)
 
-        # Replace in .bat file
-        with open(BAT_FILE, "r") as file:
-            bat_content = file.read()
-        bat_content = pushd_pattern.sub(f"pushd {new_fn_name}", bat_content)
-        bat_content = zip_pattern.sub(f"{new_fn_name}.zip", bat_content)
+        bat_content = f"@echo off\nREM {header}\n"
+        for fn_name in fn_names:
+            bat_content += (
+                f"\npushd {fn_name}\n"
+                f'powershell -Command "Compress-Archive -Path * -DestinationPath ..\\{fn_name}.zip" -Force\n'
+                "popd\n"
+            )
         with open(BAT_FILE, "w") as file:
             file.write(bat_content)
+        return True
+    except Exception as e:
+        print(f"[bold red]Error while generating package scripts: {e}[/bold red]")
+        return False
+
+
+def get_init_containers(buildcmd):
+    # Only a script path like ./build.sh needs to be made executable, not e.g. 'sh build.sh'
+    words = buildcmd.split()
+    if words and words[0].startswith("./"):
+        return [{"command": [f"chmod +x {words[0].removeprefix('./')}", buildcmd]}]
+    return [{"command": [buildcmd]}]
+
+
+def apply_manifest_to_specs(manifest):
+    """
+    Rewrites the environment and build command of the package specs and the environment and
+    entrypoint of the function specs from the manifest.
+
+    Parameters:
+        manifest (dict): The project manifest.
+
+    Returns:
+        bool: True if all existing specs were updated, False otherwise.
+    """
+    buildcmd = manifest["build"]["buildcmd"]
+    try:
+        for fn_name, config in manifest["functions"].items():
+            package_path = os.path.join(SPECS_DIR, f"package-{fn_name}.yaml")
+            if os.path.isfile(package_path):
+                with open(package_path, "r") as file:
+                    docs = list(yaml.load_all(file, Loader=YamlLoader))
+                if len(docs) > 1 and "spec" in docs[1]:
+                    spec = docs[1]["spec"]
+                    if config["env"]:
+                        spec.setdefault("environment", {})["name"] = config["env"]
+                    if "initContainers" in spec:
+                        spec["initContainers"] = get_init_containers(buildcmd)
+                    else:
+                        spec["buildcmd"] = buildcmd
+                    save_yaml_file_multi("package", fn_name, docs)
+
+            success, data = read_yaml_file("function", fn_name)
+            if success and data and "spec" in data:
+                if config["env"]:
+                    data["spec"].setdefault("environment", {})["name"] = config["env"]
+                data["spec"].setdefault("package", {})["functionName"] = config["entrypoint"]
+                save_yaml_file("function", fn_name, data)
+        return True
+    except Exception as e:
+        print(f"[bold red]Error while applying {MANIFEST_FILE} to specs: {e}[/bold red]")
+        return False
+
+
+def sync_manifest(manifest):
+    return save_manifest(manifest) and generate_package_scripts(manifest)
+
+
+def add_function_to_manifest(fn_name, env):
+    """
+    Adds a function to the manifest. Values of a function already declared in the manifest are kept,
+    the env is only used when the function has none.
+    """
+    manifest = load_manifest()
+    config = manifest["functions"].get(fn_name) or {"entrypoint": DEFAULT_ENTRYPOINT}
+    config["env"] = config.get("env") or env
+    manifest["functions"][fn_name] = config
+    return sync_manifest(manifest)
+
+
+def remove_function_from_manifest(fn_name):
+    manifest = load_manifest()
+    manifest["functions"].pop(fn_name, None)
+    return sync_manifest(manifest)
+
+
+def update_shell_scripts(fn_name, new_fn_name):
+    try:
+        manifest = load_manifest()
+        config = manifest["functions"].pop(fn_name, None)
+        if config is None:
+            # The specs still carry the old name at this point
+            try:
+                env = get_environment_from_package_config(fn_name)
+            except Exception:
+                env = None
+            config = {
+                "env": env or get_current_environment() or None,
+                "entrypoint": get_entrypoint_from_fn_config(fn_name) or DEFAULT_ENTRYPOINT,
+            }
+        manifest["functions"][new_fn_name] = config
+
+        if not sync_manifest(manifest):
+            return False
         exec_package_script()
         return True
+    except typer.Exit:
+        raise
     except Exception:
         return False
 
@@ -235,11 +490,14 @@ def get_environment_from_package_config(fn_name):
 
 def rename_fn_in_specs(fn_name, new_fn_name):
     # Delete and generate new package
-    env = get_environment_from_package_config(fn_name)
+    manifest = load_manifest()
+    config = manifest["functions"].get(new_fn_name) or {}
+    env = config.get("env") or get_environment_from_package_config(fn_name)
+    buildcmd = manifest["build"]["buildcmd"]
     delete_file_if_exists(os.path.join(SPECS_DIR, f"package-{fn_name}.yaml"))
 
     subprocess.run(
-        f"fission package create --sourcearchive {new_fn_name}.zip --env {env} --buildcmd './build.sh'  --name {new_fn_name} --spec",
+        f"fission package create --sourcearchive {new_fn_name}.zip --env {env} --buildcmd '{buildcmd}'  --name {new_fn_name} --spec",
         shell=True,
         text=False,
         capture_output=False,
@@ -278,9 +536,7 @@ def replace_build_cmd(fn_name):
             del config["spec"]["buildcmd"]
 
         # Add or modify the 'initContainers' entry in the second document
-        config["spec"]["initContainers"] = [
-            {"command": ["chmod +x build.sh", "./build.sh"]}
-        ]
+        config["spec"]["initContainers"] = get_init_containers(load_manifest()["build"]["buildcmd"])
 
         # Replace the modified document in the list
         docs[1] = config
@@ -336,6 +592,8 @@ def rename_file(old_file_path, new_file_path):
 
 def delete_function(fn_name: str):
     try:
+        remove_function_from_manifest(fn_name)
+
         delete_file_if_exists(os.path.join(SPECS_DIR, f"function-{fn_name}.yaml"))
 
         delete_file_if_exists(os.path.join(SPECS_DIR, f"route-{fn_name}.yaml"))
@@ -350,6 +608,8 @@ def delete_function(fn_name: str):
             f"[bold green]Function '{fn_name}' and its associated files have been deleted successfully.[/bold green]"
         )
         return True
+    except typer.Exit:
+        raise
     except Exception as e:
         print(
             f"[bold red]Error occurred while deleting function '{fn_name}': {e}[/bold red]"
@@ -366,6 +626,8 @@ def get_current_environment():
         env_file = [
             file for file in files if file.endswith(".yaml") and file.startswith("env")
         ]
+        if not env_file:
+            return False
         with open(f"{os.getcwd()}/specs/{env_file[0]}", "r") as file:
             yaml_content = yaml.safe_load(file)
 
@@ -402,8 +664,10 @@ def init_fission():
         )
         print(f"[Environment created {new_environment}]")
 
+        sync_manifest(load_manifest())
+
 
-def create_new_fn_spec_and_boilerplate(folder_name):
+def create_new_fn_spec_and_boilerplate(folder_name, env):
     new_folder_path = os.path.join(os.getcwd(), folder_name)
     os.makedirs(new_folder_path, exist_ok=True)
     files_to_create = ["main.py", "build.sh", "__init__.py", "requirements.txt"]
@@ -419,40 +683,199 @@ def create_new_fn_spec_and_boilerplate(folder_name):
             elif filename == "main.py":
                 file.write(f"{get_content_from_template('main', 'py')}")
 
-    dir_file_names = os.listdir()
-    lin_package = "lin-package.sh" in dir_file_names
-    file_path = os.path.join(os.getcwd(), "lin-package.sh")
-    if lin_package:
-        with open(file_path, "a") as file:
-            file.write(
-                f"\npushd {folder_name}\n"
-                f"zip -q -r ../{folder_name}.zip *\n"
-                "popd\n"
-            )
-    elif not lin_package:
-        with open(file_path, "w") as file:
-            file.write(
-                f"\npushd {folder_name}\n"
-                f"zip -q -r ../{folder_name}.zip *\n"
-                "popd\n"
-            )
+    return add_function_to_manifest(folder_name, env)
 
-    win_package = "win-package.bat" in dir_file_names
-    win_package_path = os.path.join(os.getcwd(), "win-package.bat")
 
-    if win_package:
-        with open(win_package_path, "a") as file:
-            file.write(
-                f"\npushd {folder_name}\n"
-                f'powershell -Command "Compress-Archive -Path * -DestinationPath ..\\{folder_name}.zip" -Force\n'
-                "popd\n"
-            )
-    elif not win_package:
-        with open(win_package_path, "w") as file:
-            file.write(
-                f"@echo off\n\n"
-                f"pushd {folder_name}\n"
-                f'powershell -Command "Compress-Archive -Path * -DestinationPath ..\\{folder_name}.zip" -Force\n'
-                "popd\n"
-            )
-    return True
+def spec_file_sort_key(file_name: str):
+    prefix, _, rest = file_name.partition("-")
+    if prefix in SPEC_PREFIX_ORDER:
+        return SPEC_PREFIX_ORDER.index(prefix), rest
+    return len(SPEC_PREFIX_ORDER), file_name
+
+
+def get_referenced_environments(file_names):
+    """
+    Returns the environment names referenced by the given package and function spec files.
+    """
+    env_names = set()
+    for file_name in file_names:
+        if not file_name.startswith(("package-", "function-")):
+            continue
+        with open(os.path.join(SPECS_DIR, file_name), "r") as file:
+            for doc in yaml.load_all(file, Loader=YamlLoader):
+                try:
+                    env_names.add(doc["spec"]["environment"]["name"])
+                except (KeyError, TypeError):
+                    continue
+    return env_names
+
+
+def find_environment_spec_files(env_names):
+    """
+    Returns the env spec files defining the given environments and the environment names no spec was found for.
+    """
+    file_names = []
+    missing = set(env_names)
+    for file_name in os.listdir(SPECS_DIR):
+        if not (file_name.startswith("env-") and file_name.endswith(".yaml")):
+            continue
+        with open(os.path.join(SPECS_DIR, file_name), "r") as file:
+            data = yaml.load(file, Loader=YamlLoader)
+        try:
+            env_name = data["metadata"]["name"]
+        except (KeyError, TypeError):
+            continue
+        if env_name in env_names:
+            file_names.append(file_name)
+            missing.discard(env_name)
+    return file_names, sorted(missing)
+
+
+def enumerate_spec_files(fn_names=None):
+    """
+    Lists the spec files to be bundled in a stable order: environments first, then packages,
+    functions and routes, then any other spec file. The deployment config is never included.
+    When restricted to some functions, only their package, function and route specs and the
+    env specs they reference are listed; other triggers (timers, message queues, ...) are not.
+
+    Parameters:
+        fn_names (list[str] | None): Restrict the listing to the specs of these functions.
+
+    Returns:
+        list[str]: File names relative to the specs directory.
+    """
+    if fn_names:
+        candidates = [f"{prefix}-{fn_name}.yaml" for fn_name in fn_names for prefix in SPEC_PREFIX_ORDER[1:]]
+        file_names = [name for name in candidates if os.path.isfile(os.path.join(SPECS_DIR, name))]
+
+        env_files, missing = find_environment_spec_files(get_referenced_environments(file_names))
+        if missing:
+            print(f"[bold yellow]No env spec found for: {', '.join(missing)}[/bold yellow]")
+        file_names += env_files
+    else:
+        file_names = [
+            name
+            for name in os.listdir(SPECS_DIR)
+            if name.endswith(".yaml") and name != DEPLOYMENT_CONFIG_FILE
+        ]
+
+    return sorted(set(file_names), key=spec_file_sort_key)
+
+
+def find_unknown_functions(fn_names):
+    """
+    Returns the function names that have no package, function or route spec.
+    """
+    return [
+        fn_name
+        for fn_name in fn_names
+        if not any(os.path.isfile(os.path.join(SPECS_DIR, f"{prefix}-{fn_name}.yaml")) for prefix in SPEC_PREFIX_ORDER[1:])
+    ]
+
+
+def is_valid_bundle_dir(bundle_dir: str):
+    """
+    fission spec apply resolves the archive 'include' paths (e.g. fn.zip) from the parent of --specdir,
+    so a bundle only works from a directory directly under the project root, other than the specs directory.
+    """
+    bundle_path = os.path.abspath(bundle_dir)
+    return os.path.dirname(bundle_path) == os.getcwd() and bundle_path != os.path.abspath(SPECS_DIR)
+
+
+def bundle_specs(fn_names=None, bundle_dir=BUNDLE_DIR):
+    """
+    Streams the spec files into a single multi-document YAML bundle, one document at a time.
+    Each file's documents are preceded by a source marker comment so the bundle can be split back.
+
+    Parameters:
+        fn_names (list[str] | None): Only bundle the specs of these functions.
+        bundle_dir (str): Directory the bundle and the deployment config are written to.
+
+    Returns:
+        int | None: Number of spec files bundled, None on failure.
+    """
+    if not is_valid_bundle_dir(bundle_dir):
+        print(
+            f"[bold red]The bundle directory {bundle_dir} must sit directly under the project root "
+            "and must not be the specs directory.[/bold red]"
+        )
+        return None
+
+    try:
+        if fn_names:
+            unknown = find_unknown_functions(fn_names)
+            if unknown:
+                print(f"[bold yellow]No specs found for: {', '.join(unknown)}[/bold yellow]")
+
+        file_names = enumerate_spec_files(fn_names)
+        if not file_names:
+            print("[bold red]No spec files matched, nothing to bundle.[/bold red]")
+            return None
+
+        os.makedirs(bundle_dir, exist_ok=True)
+    except Exception as e:
+        print(f"[bold red]Error while bundling specs: {e}[/bold red]")
+        return None
+
+    # Write to a temporary file and only move it into place once every spec was written,
+    # so a failure never leaves a truncated bundle behind
+    temp_file = tempfile.NamedTemporaryFile("w", dir=bundle_dir, suffix=".tmp", delete=False)
+    try:
+        with temp_file as bundle:
+            for file_name in file_names:
+                bundle.write(f"{BUNDLE_SOURCE_MARKER}{file_name}\n")
+                with open(os.path.join(SPECS_DIR, file_name), "r") as file:
+                    yaml.dump_all(
+                        yaml.load_all(file, Loader=YamlLoader),
+                        bundle,
+                        Dumper=YamlDumper,
+                        explicit_start=True,
+                        default_flow_style=False,
+                        sort_keys=False,
+                    )
+
+        # fission spec apply --specdir expects the deployment config next to the specs
+        deployment_config = os.path.join(SPECS_DIR, DEPLOYMENT_CONFIG_FILE)
+        if os.path.isfile(deployment_config):
+            shutil.copyfile(deployment_config, os.path.join(bundle_dir, DEPLOYMENT_CONFIG_FILE))
+
+        os.replace(temp_file.name, os.path.join(bundle_dir, BUNDLE_FILE))
+        return len(file_names)
+    except Exception as e:
+        print(f"[bold red]Error while bundling specs: {e}[/bold red]")
+        os.remove(temp_file.name)
+        return None
+
+
+def split_bundle(bundle_path: str, specs_dir=SPECS_DIR):
+    """
+    Splits a bundle created by bundle_specs back into per-function spec files, line by line.
+
+    Parameters:
+        bundle_path (str): Path of the bundle file.
+        specs_dir (str): Directory the spec files are written to.
+
+    Returns:
+        list[str] | None: File names written, None on failure.
+    """
+    written = []
+    output = None
+    try:
+        os.makedirs(specs_dir, exist_ok=True)
+        with open(bundle_path, "r") as bundle:
+            for line in bundle:
+                if line.startswith(BUNDLE_SOURCE_MARKER):
+                    if output is not None:
+                        output.close()
+                    file_name = os.path.basename(line[len(BUNDLE_SOURCE_MARKER) :].strip())
+                    output = open(os.path.join(specs_dir, file_name), "w")
+                    written.append(file_name)
+                elif output is not None:
+                    output.write(line)
+        return written
+    except Exception as e:
+        print(f"[bold red]Error while splitting bundle {bundle_path}: {e}[/bold red]")
+        return None
+    finally:
+        if output is not None:
+            output.close()
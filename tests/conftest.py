@@ -0,0 +1,52 @@
+import os
+
+import pytest
+import yaml
+
+from fizz_cli import utils
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utils, "exec_package_script", lambda: True)
+    os.makedirs(utils.SPECS_DIR)
+    with open(os.path.join(utils.SPECS_DIR, "env-test.yaml"), "w") as file:
+        yaml.safe_dump({"apiVersion": "fission.io/v1", "kind": "Environment", "metadata": {"name": "env-test"}}, file)
+    return tmp_path
+
+
+@pytest.fixture
+def write_specs(project):
+    def write(fn_name: str, env: str = "env-test", entrypoint: str = "app.handler"):
+        with open(os.path.join(utils.SPECS_DIR, f"package-{fn_name}.yaml"), "w") as file:
+            yaml.safe_dump_all(
+                [
+                    {"kind": "ArchiveUploadSpec", "name": f"{fn_name}-zip", "include": [f"{fn_name}.zip"]},
+                    {
+                        "kind": "Package",
+                        "metadata": {"name": fn_name},
+                        "spec": {"environment": {"name": env}, "buildcmd": "./build.sh"},
+                    },
+                ],
+                file,
+            )
+        with open(os.path.join(utils.SPECS_DIR, f"function-{fn_name}.yaml"), "w") as file:
+            yaml.safe_dump(
+                {
+                    "kind": "Function",
+                    "metadata": {"name": fn_name},
+                    "spec": {
+                        "environment": {"name": env},
+                        "package": {"functionName": entrypoint, "packageref": {"name": fn_name}},
+                    },
+                },
+                file,
+            )
+        with open(os.path.join(utils.SPECS_DIR, f"route-{fn_name}.yaml"), "w") as file:
+            yaml.safe_dump(
+                {"kind": "HTTPTrigger", "metadata": {"name": fn_name}, "spec": {"functionref": {"name": fn_name}}},
+                file,
+            )
+
+    return write
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+import yaml
+
+from fizz_cli import utils
+
+
+def read_docs(path: str):
+    with open(path, "r") as file:
+        return list(yaml.safe_load_all(file))
+
+
+@pytest.fixture
+def specs(project, write_specs):
+    with open(os.path.join(utils.SPECS_DIR, utils.DEPLOYMENT_CONFIG_FILE), "w") as file:
+        yaml.safe_dump({"kind": "DeploymentConfig", "uid": "abc"}, file)
+    with open(os.path.join(utils.SPECS_DIR, "env-unused.yaml"), "w") as file:
+        yaml.safe_dump({"kind": "Environment", "metadata": {"name": "env-unused"}}, file)
+    for fn_name in ["beta", "alpha"]:
+        write_specs(fn_name)
+    return project
+
+
+def test_bundle_order_is_stable(specs):
+    assert utils.bundle_specs() == 8
+
+    with open(os.path.join(utils.BUNDLE_DIR, utils.BUNDLE_FILE), "r") as file:
+        sources = [line[len(utils.BUNDLE_SOURCE_MARKER) :].strip() for line in file if line.startswith(utils.BUNDLE_SOURCE_MARKER)]
+
+    assert sources == [
+        "env-test.yaml",
+        "env-unused.yaml",
+        "package-alpha.yaml",
+        "package-beta.yaml",
+        "function-alpha.yaml",
+        "function-beta.yaml",
+        "route-alpha.yaml",
+        "route-beta.yaml",
+    ]
+    assert os.path.isfile(os.path.join(utils.BUNDLE_DIR, utils.DEPLOYMENT_CONFIG_FILE))
+
+
+def test_bundle_split_round_trip(specs):
+    utils.bundle_specs()
+
+    written = utils.split_bundle(os.path.join(utils.BUNDLE_DIR, utils.BUNDLE_FILE), "./split")
+
+    assert len(written) == 8
+    for file_name in written:
+        assert read_docs(os.path.join("./split", file_name)) == read_docs(os.path.join(utils.SPECS_DIR, file_name))
+    assert len(read_docs("./split/package-alpha.yaml")) == 2
+
+
+def test_bundle_subset_includes_referenced_env(specs):
+    assert utils.bundle_specs(["beta"]) == 4
+    assert read_docs(os.path.join(utils.BUNDLE_DIR, utils.BUNDLE_FILE)) == (
+        read_docs("specs/env-test.yaml")
+        + read_docs("specs/package-beta.yaml")
+        + read_docs("specs/function-beta.yaml")
+        + read_docs("specs/route-beta.yaml")
+    )
+
+
+def test_bundle_reports_unknown_functions(specs):
+    assert utils.find_unknown_functions(["alpha", "nope"]) == ["nope"]
+    assert utils.bundle_specs(["alpha", "nope"]) == 4
+    assert utils.bundle_specs(["nope"]) is None
+
+
+def test_bundle_dir_must_be_under_project_root(specs):
+    assert utils.bundle_specs(bundle_dir="./nested/bundle") is None
+    assert utils.bundle_specs(bundle_dir=utils.SPECS_DIR) is None
+    assert not os.path.exists("./nested")
+
+
+def test_failed_bundle_keeps_previous_bundle(specs):
+    utils.bundle_specs()
+    previous = read_docs(os.path.join(utils.BUNDLE_DIR, utils.BUNDLE_FILE))
+
+    with open(os.path.join(utils.SPECS_DIR, "route-beta.yaml"), "w") as file:
+        file.write("kind: [unclosed\n")
+
+    assert utils.bundle_specs() is None
+    assert read_docs(os.path.join(utils.BUNDLE_DIR, utils.BUNDLE_FILE)) == previous
+    assert set(os.listdir(utils.BUNDLE_DIR)) == {utils.BUNDLE_FILE, utils.DEPLOYMENT_CONFIG_FILE}
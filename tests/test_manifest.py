@@ -0,0 +1,188 @@
+import os
+
+import pytest
+import typer
+import yaml
+
+from fizz_cli import main
+from fizz_cli import utils
+
+
+def read_file(path: str):
+    with open(path, "r") as file:
+        return file.read()
+
+
+def write_manifest(content: str):
+    with open(utils.MANIFEST_FILE, "w") as file:
+        file.write(content)
+
+
+def test_scripts_follow_new_rename_and_delete(project):
+    utils.create_new_fn_spec_and_boilerplate("alpha", "env-test")
+    utils.create_new_fn_spec_and_boilerplate("beta", "env-test")
+    assert "pushd alpha" in read_file(utils.SH_FILE)
+    assert "..\\beta.zip" in read_file(utils.BAT_FILE)
+
+    utils.rename_folder("alpha", "gamma")
+    assert utils.update_shell_scripts("alpha", "gamma")
+    assert "pushd alpha" not in read_file(utils.SH_FILE)
+    assert "pushd gamma" in read_file(utils.SH_FILE)
+    assert "pushd gamma" in read_file(utils.BAT_FILE)
+
+    assert utils.delete_function("beta")
+    assert "beta" not in read_file(utils.SH_FILE)
+    assert "beta" not in read_file(utils.BAT_FILE)
+    assert list(utils.load_manifest()["functions"]) == ["gamma"]
+
+
+def test_new_keeps_values_declared_in_manifest(project):
+    write_manifest("functions:\n  alpha:\n    entrypoint: app.handler\n")
+
+    utils.create_new_fn_spec_and_boilerplate("alpha", "env-test")
+
+    assert utils.load_manifest()["functions"]["alpha"] == {"entrypoint": "app.handler", "env": "env-test"}
+
+
+def test_new_without_env_leaves_no_trace(project):
+    os.remove(os.path.join(utils.SPECS_DIR, "env-test.yaml"))
+
+    main.new("alpha")
+
+    assert not os.path.exists("alpha")
+    assert not os.path.exists(utils.MANIFEST_FILE)
+    assert not os.path.exists(utils.SH_FILE)
+
+
+def test_migration_from_specs_only_project(project, write_specs, capsys):
+    write_specs("alpha", "env-other")
+    write_specs("ghost")
+    os.makedirs("alpha")
+    with open(utils.SH_FILE, "w") as file:
+        file.write("\npushd alpha\nzip -q -r ../alpha.zip *\npopd\necho hi\n")
+
+    manifest = utils.load_manifest()
+    assert manifest["functions"] == {"alpha": {"env": "env-other", "entrypoint": "app.handler"}}
+    assert "ghost" in capsys.readouterr().out
+
+    utils.sync_manifest(manifest)
+    assert "echo hi" in read_file(f"{utils.SH_FILE}.bak")
+    assert "echo hi" not in read_file(utils.SH_FILE)
+
+
+def test_rename_as_first_command_keeps_spec_values(project, write_specs, monkeypatch, capsys):
+    write_specs("alpha", "env-other")
+    os.makedirs("alpha")
+    monkeypatch.setattr(main.typer, "confirm", lambda *args, **kwargs: True)
+    monkeypatch.setattr(main.typer, "prompt", lambda *args, **kwargs: "gamma")
+    monkeypatch.setattr(main, "rename_fn_in_specs", lambda fn_name, new_fn_name: None)
+
+    main.rename("alpha")
+
+    assert utils.load_manifest()["functions"] == {"gamma": {"env": "env-other", "entrypoint": "app.handler"}}
+    assert "No code folder found" not in capsys.readouterr().out
+    assert os.path.isdir("gamma")
+
+
+def test_rename_fn_in_specs_takes_env_from_manifest(project, write_specs, monkeypatch):
+    write_specs("alpha", "env-other")
+    write_manifest("functions:\n  gamma:\n    env: env-test\n")
+    commands = []
+
+    def run(command, **kwargs):
+        commands.append(command)
+        write_specs("gamma", "env-test")
+
+    monkeypatch.setattr(utils.subprocess, "run", run)
+
+    utils.rename_fn_in_specs("alpha", "gamma")
+
+    assert "--env env-test" in commands[0]
+    _, function = utils.read_yaml_file("function", "gamma")
+    assert function["metadata"]["name"] == "gamma"
+
+
+def test_delete_without_env_spec_or_manifest(project):
+    os.remove(os.path.join(utils.SPECS_DIR, "env-test.yaml"))
+    os.makedirs("alpha")
+
+    assert utils.delete_function("alpha")
+    assert not os.path.exists("alpha")
+
+
+def test_null_entries_are_normalised(project):
+    write_manifest("build:\nfunctions:\n  alpha:\n")
+
+    assert utils.load_manifest() == {
+        "build": {"buildcmd": utils.DEFAULT_BUILDCMD},
+        "functions": {"alpha": {"env": None, "entrypoint": utils.DEFAULT_ENTRYPOINT}},
+    }
+
+
+def test_numeric_function_names_become_strings(project):
+    write_manifest("functions:\n  2024:\n    env: env-test\n  alpha:\n")
+
+    manifest = utils.load_manifest()
+
+    assert list(manifest["functions"]) == ["2024", "alpha"]
+    assert utils.sync_manifest(manifest)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "build: ./build.sh\n",
+        "build:\n  buildcmd: '  '\n",
+        "functions:\n  alpha: app.handler\n",
+        "functions:\n  alpha:\n    env: [a, b]\n",
+        "functions: [alpha]\n",
+        "- alpha\n",
+        "functions: {alpha\n",
+    ],
+)
+def test_malformed_manifest_exits_with_error(project, capsys, content):
+    write_manifest(content)
+
+    with pytest.raises(typer.Exit):
+        utils.load_manifest()
+    assert f"Malformed {utils.MANIFEST_FILE}" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "buildcmd, command",
+    [
+        ("./build.sh", ["chmod +x build.sh", "./build.sh"]),
+        ("./scripts/build.sh --fast", ["chmod +x scripts/build.sh", "./scripts/build.sh --fast"]),
+        ("sh build.sh", ["sh build.sh"]),
+        ("bash -c 'pip install .'", ["bash -c 'pip install .'"]),
+    ],
+)
+def test_init_containers(buildcmd, command):
+    assert utils.get_init_containers(buildcmd) == [{"command": command}]
+
+
+def test_apply_manifest_to_specs(project, write_specs):
+    write_specs("alpha")
+    manifest = {
+        "build": {"buildcmd": "./make.sh"},
+        "functions": {"alpha": {"env": "env-new", "entrypoint": "main.run"}},
+    }
+
+    assert utils.apply_manifest_to_specs(manifest)
+
+    with open(os.path.join(utils.SPECS_DIR, "package-alpha.yaml"), "r") as file:
+        package = list(yaml.safe_load_all(file))[1]["spec"]
+    assert package["environment"]["name"] == "env-new"
+    assert package["buildcmd"] == "./make.sh"
+
+    _, function = utils.read_yaml_file("function", "alpha")
+    assert function["spec"]["environment"]["name"] == "env-new"
+    assert function["spec"]["package"]["functionName"] == "main.run"
+
+    with open(utils.MANIFEST_FILE, "w") as file:
+        yaml.safe_dump(manifest, file)
+    utils.replace_build_cmd("alpha")
+    with open(os.path.join(utils.SPECS_DIR, "package-alpha.yaml"), "r") as file:
+        package = list(yaml.safe_load_all(file))[1]["spec"]
+    assert package["initContainers"] == [{"command": ["chmod +x make.sh", "./make.sh"]}]
+    assert "buildcmd" not in package